@@ -1,26 +1,43 @@
-import json
+import pickle
 import random
+import sys
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
-from urllib.parse import parse_qs, urlparse
+from urllib.parse import parse_qs, urlsplit
+
+import orjson
+from loguru import logger
 
 CONFIG_DIR = Path(__file__).parent
 CONFIG_FILE = CONFIG_DIR / "config.json"
-"""# Define the path to the config directory
+# Parsed-settings cache, keyed by config.json's mtime so edits invalidate it.
+CACHE_FILE = CONFIG_DIR / "config.cache.pkl"
+# Bump whenever the settings tuple layout changes, so an old cache written
+# by previous code is treated as a miss even if config.json is untouched.
+_CACHE_VERSION = 1
 
 
-# Load configuration files
-def load_config(file_name):
-    config_path = CONFIG_DIR / file_name
-    with open(config_path, "r") as file:
-        return json.load(file)
+@lru_cache(maxsize=None)
+def _read_config() -> Dict[str, Any]:
+    """Parse config.json once per process."""
+    return orjson.loads(CONFIG_FILE.read_bytes())
 
 
-# Initialize configuration
-config = load_config("config.json")
-"""
+@lru_cache(maxsize=None)
+def _select_base_response() -> Dict[str, Any]:
+    """Draw this process's base_response on first use."""
+    # Dynamiskt val av ett `base_response`
+    config = _read_config()
+    if "base_responses" in config and config["base_responses"]:
+        base_response = random.choice(config["base_responses"])
+        logger.debug(f"Selected dynamic base_response: {base_response}")
+        return base_response
+    logger.warning("No base_responses found in config.json, using empty response.")
+    return {}
 
 
+@lru_cache(maxsize=None)
 def load_config() -> (
     Tuple[
         str,
@@ -30,49 +47,86 @@ def load_config() -> (
         List[Dict[str, str]],
         Dict[str, Dict[str, Any]],
         Dict[str, Any],
+        bool,
     ]
 ):
     """Load configuration from config.json and parse URL."""
-    with open(CONFIG_FILE, "r") as config_file:
-        config = json.load(config_file)
+    # A pickle of the fully parsed settings skips the JSON and URL parsing
+    # on every run after the first. BASE_RESPONSE is drawn per process in
+    # _select_base_response, so the random choice is never baked into the
+    # cache.
+    mtime = CONFIG_FILE.stat().st_mtime_ns
+    try:
+        version, cached_mtime, settings = pickle.loads(CACHE_FILE.read_bytes())
+        if version == _CACHE_VERSION and cached_mtime == mtime:
+            # Interning does not survive pickling, so redo it on load.
+            settings = list(settings)
+            settings[5] = {sys.intern(k): v for k, v in settings[5].items()}
+            logger.debug("Loaded configuration from cache.")
+            return tuple(settings)
+    except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+        pass
+
+    config = _read_config()
 
-    parsed_url = urlparse(config["url"])
+    # urlsplit skips urlparse's unused `;params` handling.
+    parsed_url = urlsplit(config["url"])
     base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
     path = parsed_url.path
     host = parsed_url.netloc
     query_params = parse_qs(parsed_url.query)
 
-    # Dynamiskt val av ett `base_response`
-    if "base_responses" in config and config["base_responses"]:
-        base_response = random.choice(config["base_responses"])
-        logger.debug(f"Selected dynamic base_response: {base_response}")
-    else:
-        base_response = {}
-        logger.warning("No base_responses found in config.json, using empty response.")
+    # Interned keys let the per-form dicts hash and compare them by pointer.
+    data_params = {sys.intern(k): v for k, v in config["data_params"].items()}
 
     test_mode = config.get("test_mode", False)
     logger.debug("Loaded configuration successfully.")
-    return (
+    settings = (
         base_url,
         path,
         host,
         query_params,
         config["headers_list"],
-        config["data_params"],
-        base_response,
+        data_params,
         config["form_post_url"],
         test_mode,
     )
 
+    try:
+        CACHE_FILE.write_bytes(
+            pickle.dumps((_CACHE_VERSION, mtime, settings), protocol=5)
+        )
+    except OSError:
+        logger.warning("Could not write config cache; continuing without it.")
+
+    return settings
+
+
+# Settings are resolved lazily (PEP 562) so importing `config` does not pay
+# for JSON parsing and URL parsing until a value is first read. BASE_RESPONSE
+# is drawn separately so startup never touches the base_responses list.
+_INDEX = {
+    "BASE_URL": 0,
+    "PATH": 1,
+    "HOST": 2,
+    "QUERY_PARAMS": 3,
+    "HEADERS_LIST": 4,
+    "DATA_PARAMS": 5,
+    "FORM_POST_URL": 6,
+    "TEST_MODE": 7,
+}
+
 
-(
-    BASE_URL,
-    PATH,
-    HOST,
-    QUERY_PARAMS,
-    HEADERS_LIST,
-    DATA_PARAMS,
-    BASE_RESPONSE,
-    FORM_POST_URL,
-    TEST_MODE,
-) = load_config()
+def __getattr__(name: str):
+    if name == "BASE_RESPONSE":
+        return _select_base_response()
+    # Resolve the index first so a KeyError from inside load_config (e.g. a
+    # config.json missing a required key) propagates instead of being
+    # misreported as an unknown module attribute.
+    try:
+        index = _INDEX[name]
+    except KeyError:
+        raise AttributeError(
+            f"module {__name__!r} has no attribute {name!r}"
+        ) from None
+    return load_config()[index]
@@ -1,9 +1,55 @@
+from __future__ import annotations
+
 import re
+from typing import TYPE_CHECKING, Optional, Tuple, Union
 
-from bs4 import BeautifulSoup
 from http_client import HTTPClient
 from loguru import logger
 
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Compiled once at import time; recompiling per call is pure overhead on the
+# hot scraping path. The bytes twins let callers scan the raw response body
+# without decoding it first.
+_HELPER_COOKIE_CAPTURE_RE = re.compile(
+    r'Helper\.setCookie\("([^"]+)",\s*"([^"]+)",\s*(true|false)\)'
+)
+_HELPER_COOKIE_CAPTURE_RE_BYTES = re.compile(
+    rb'Helper\.setCookie\("([^"]+)",\s*"([^"]+)",\s*(true|false)\)'
+)
+
+# Every JS-cookie pattern scanned per response. A multi-pattern engine such
+# as hyperscan or re2 only pays off once several expressions live here; with
+# one pattern the str.find fast path below is already the cheapest scan.
+_COOKIE_PATTERNS = [_HELPER_COOKIE_CAPTURE_RE]
+_COOKIE_PATTERNS_BYTES = [_HELPER_COOKIE_CAPTURE_RE_BYTES]
+
+_HELPER_COOKIE_PREFIX = 'Helper.setCookie("'
+_HELPER_COOKIE_PREFIX_BYTES = b'Helper.setCookie("'
+
+
+def _find_cookie(text: Union[str, bytes]) -> Optional[Tuple[str, str]]:
+    """Locate the first well-formed Helper.setCookie name/value pair."""
+    if isinstance(text, bytes):
+        prefix, pattern = _HELPER_COOKIE_PREFIX_BYTES, _HELPER_COOKIE_CAPTURE_RE_BYTES
+    else:
+        prefix, pattern = _HELPER_COOKIE_PREFIX, _HELPER_COOKIE_CAPTURE_RE
+    # str.find jumps straight to the candidate call; the anchored match then
+    # validates the full call shape (both arguments and the true/false flag)
+    # so a truncated or variant call falls through to the search fallback
+    # instead of yielding garbage from unrelated quotes.
+    i = text.find(prefix)
+    if i == -1:
+        return None
+    match = pattern.match(text, i)
+    if match is None:
+        return None
+    name, value = match.group(1), match.group(2)
+    if isinstance(name, bytes):
+        return name.decode(), value.decode()
+    return name, value
+
 
 class CookieHandler:
     """Handles parsing and setting cookies from HTML."""
@@ -12,24 +58,38 @@ class CookieHandler:
         self.client = client
         self.host = host
 
-    def parse_and_set_cookies(self, soup: BeautifulSoup):
-        """Extract and set cookies from JavaScript in the response."""
+    def parse_and_set_cookies_from_js(self, text: Union[str, bytes]):
+        """Extract and set cookies by scanning the raw response body."""
         try:
-            script_tag = soup.find(string=re.compile("Helper.setCookie"))
-            if script_tag:
-                logger.info("JavaScript containing cookies found.")
-                pattern = r'Helper\.setCookie\("([^"]+)",\s*"([^"]+)",\s*(true|false)\)'
-                match = re.search(pattern, script_tag)
-                if match:
-                    cookie_name, cookie_value, _ = match.groups()
-                    self.client.new_cookie(
-                        (cookie_name, cookie_value), domain=self.host, path="/"
-                    )
-                    logger.info(f"New cookie set: {cookie_name}")
-                else:
-                    logger.warning("No matching cookie pattern found in script tag.")
+            # str.find scans the literal call shape without regex machinery;
+            # the compiled pattern stays as a fallback for unusual formatting.
+            cookie = _find_cookie(text)
+            if cookie is None:
+                patterns = (
+                    _COOKIE_PATTERNS_BYTES
+                    if isinstance(text, bytes)
+                    else _COOKIE_PATTERNS
+                )
+                for pattern in patterns:
+                    match = pattern.search(text)
+                    if match:
+                        name, value = match.group(1), match.group(2)
+                        if isinstance(name, bytes):
+                            name, value = name.decode(), value.decode()
+                        cookie = (name, value)
+                        break
+            if cookie:
+                cookie_name, cookie_value = cookie
+                self.client.new_cookie(
+                    (cookie_name, cookie_value), domain=self.host, path="/"
+                )
+                logger.info(f"New cookie set: {cookie_name}")
             else:
-                logger.warning("No script matching 'Helper.setCookie' found.")
+                logger.warning("No 'Helper.setCookie' call found in response text.")
         except Exception as e:
             logger.error(f"Error parsing cookie: {e}")
             raise
+
+    def parse_and_set_cookies(self, soup: BeautifulSoup):
+        """Extract and set cookies from JavaScript in the response."""
+        self.parse_and_set_cookies_from_js(str(soup))
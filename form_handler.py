@@ -1,17 +1,51 @@
-import json
-from typing import Any, Dict, Optional
-from urllib.parse import parse_qs, urlparse
+from __future__ import annotations
 
-from bs4 import BeautifulSoup
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+import orjson
 from config import BASE_RESPONSE, DATA_PARAMS, HOST, TEST_MODE
 from cookie_handler import CookieHandler
 from http_client import IHTTPClient
 from loguru import logger
-from pydantic import BaseModel
+from lxml import html
+
+if TYPE_CHECKING:
+    import httpx
+
+# DATA_PARAMS is immutable config, so the per-key attrs dicts are built once
+# at import instead of on every fetch_dynamic_values call.
+_ATTRS_CACHE = {
+    key: dict(zip(param["attrs"], param["query"], strict=False))
+    for key, param in DATA_PARAMS.items()
+}
+
+# collect_ids=False skips libxml2's id-index bookkeeping we never use.
+_HTML_PARSER = html.HTMLParser(collect_ids=False)
+
+
+def _intern_name(tag: html.HtmlElement) -> Optional[str]:
+    """Return the tag's name attribute, interned so both payload dicts share it."""
+    name = tag.get("name")
+    return sys.intern(name) if name is not None else None
+
+# Keys whose values are sent but kept out of the fr_formData payload.
+_NO_FR_DATA_KEYS = frozenset({"CSRFToken", "fr_fupUniqueId"})
 
+# Maps each (attribute, value) pair back to its DATA_PARAMS keys so a single
+# walk over the tree can collect every target element at once.
+_MATCH_TABLE: Dict[Tuple[str, str], List[str]] = {}
+for _key, _attrs in _ATTRS_CACHE.items():
+    for _item in _attrs.items():
+        _MATCH_TABLE.setdefault(_item, []).append(_key)
 
-class FormData(BaseModel):
-    """Model to represent and validate form data."""
+
+@dataclass(slots=True)
+class FormData:
+    """Model to represent form data."""
 
     data: Dict[str, Any]
 
@@ -55,43 +89,153 @@ class FormHandler:
         Returns:
             Dict[str, str]: The attributes for the given key.
         """
-        attrs = dict(
-            zip(DATA_PARAMS[key]["attrs"], DATA_PARAMS[key]["query"], strict=False)
-        )
-        logger.debug(f"Attributes for key '{key}': {attrs}")
-        return attrs
+        return _ATTRS_CACHE[key]
 
-    def set_new_url(self, tag: BeautifulSoup) -> None:
+    def set_new_url(self, tag: html.HtmlElement) -> None:
         """
         Set a new URL for the form submission.
 
         Args:
-            tag (BeautifulSoup): The tag containing the new URL.
+            tag (html.HtmlElement): The tag containing the new URL.
         """
-        url_object = urlparse(tag.get("action"))
-        self.path = url_object.path
-        self.query_params.clear()
-        self.query_params = parse_qs(url_object.query)
+        # Only path and query are read here, so a plain string split beats a
+        # full URL parse on this per-submission path.
+        action = tag.get("action") or ""
+        action, _, _ = action.partition("#")
+        path, _, query = action.partition("?")
+        self.path = path
+        self.query_params = parse_qs(query) if query else {}
         logger.info(f"Form submission URL updated to: {self.path}")
 
-    def append_url_query(self, tag: BeautifulSoup) -> None:
+    def append_url_query(self, tag: html.HtmlElement) -> None:
         """
         Append additional query parameters.
 
         Args:
-            tag (BeautifulSoup): The tag containing the query parameters.
+            tag (html.HtmlElement): The tag containing the query parameters.
         """
         self.query_params["qs_actionMode"] = [tag.get("value", "")]
         self.query_params["qs_template"] = ["stage"]
         self.query_params["rq_xhr"] = ["31"]
-        logger.debug(f"Updated query parameters: {self.query_params}")
+        logger.opt(lazy=True).debug(
+            "Updated query parameters: {}", lambda: self.query_params
+        )
 
-    def fetch_dynamic_values(self, soup: BeautifulSoup) -> Dict[str, Any]:
+    def _collect_tags(
+        self, tree: html.HtmlElement
+    ) -> Tuple[Dict[str, html.HtmlElement], List[html.HtmlElement]]:
+        """
+        Collect every DATA_PARAMS target element in a single tree walk.
+
+        Args:
+            tree (html.HtmlElement): The parsed document to scan.
+
+        Returns:
+            Tuple[Dict[str, html.HtmlElement], List[html.HtmlElement]]: The
+            first matching element per key, and all upTextareaControl matches.
+        """
+        tags: Dict[str, html.HtmlElement] = {}
+        textareas: List[html.HtmlElement] = []
+
+        for el in tree.iter():
+            attrib = el.attrib
+            for item in attrib.items():
+                for key in _MATCH_TABLE.get(item, ()):
+                    attrs = _ATTRS_CACHE[key]
+                    if len(attrs) > 1 and not all(
+                        attrib.get(a) == v for a, v in attrs.items()
+                    ):
+                        continue
+                    if key == "upTextareaControl":
+                        textareas.append(el)
+                    elif key not in tags:
+                        tags[key] = el
+        return tags, textareas
+
+    def _handle_base_response(self, key, tag, data, fr_data):
+        """Fill a select-like control (and its hidden sibling) from BASE_RESPONSE."""
+        if key == "Project" and tag.get("name") is not None:
+            value = tag[0].get("value", "")
+        elif key == "jquery":
+            value = tag.getnext().get("value", "")
+        else:
+            value = BASE_RESPONSE.get(key, "")
+
+        name = _intern_name(tag)
+        data[name] = [value]
+        fr_data[name] = value
+
+        sibling = tag.getparent().getnext()
+        if sibling is not None and sibling.get("name") is not None:
+            sibling_name = _intern_name(sibling)
+            sibling_value = sibling.get("value", "")
+            data[sibling_name] = [sibling_value]
+            fr_data[sibling_name] = sibling_value
+        return value
+
+    def _handle_action_id(self, key, tag, data, fr_data):
+        """Record the action id and extend the query string for submission."""
+        self.append_url_query(tag)
+        value = tag.get("value", "")
+        name = _intern_name(tag)
+        data[name] = [value]
+        fr_data[name] = value
+        return value
+
+    def _handle_form_state(self, key, tag, data, fr_data):
+        """Copy the serialized form state, decoding it for fr_data."""
+        value = tag.get("value")
+        name = _intern_name(tag)
+        data[name] = [value]
+        fr_data[name] = orjson.loads(value)
+        return value
+
+    def _handle_submitted_by(self, key, tag, data, fr_data):
+        """Fill the submitter field from BASE_RESPONSE."""
+        value = BASE_RESPONSE.get(key, "Default User")
+        name = _intern_name(tag)
+        data[name] = [value]
+        fr_data[name] = value
+        return value
+
+    def _handle_header_container(self, key, tag, data, fr_data):
+        """Extract the form identity fields and redirect the submission URL."""
+        fr_data["fr_formGuid"] = tag.get("class", "").split()[0][5:]
+        fr_data["fr_formName"] = tag.get("name", "")
+        fr_data["fr_uniqueId"] = tag.get("id", "")
+        self.set_new_url(tag)
+        return None
+
+    def _handle_value(self, key, tag, data, fr_data):
+        """Copy the tag's value verbatim (default handler)."""
+        value = tag.get("value", "")
+        name = _intern_name(tag)
+        data[name] = [value]
+        if key not in _NO_FR_DATA_KEYS:
+            fr_data[name] = value
+        return value
+
+    # O(1) dispatch instead of the old if/elif chain of string compares.
+    _HANDLERS = {
+        "Project": _handle_base_response,
+        "Location": _handle_base_response,
+        "Good Save Type": _handle_base_response,
+        "Good Save Category": _handle_base_response,
+        "Good Save Classification": _handle_base_response,
+        "Risk Category": _handle_base_response,
+        "jquery": _handle_base_response,
+        "fr_ActionId": _handle_action_id,
+        "fr_formState": _handle_form_state,
+        "Submitted By": _handle_submitted_by,
+        "Header_Container_AppMain": _handle_header_container,
+    }
+
+    def fetch_dynamic_values(self, tree: html.HtmlElement) -> Dict[str, Any]:
         """
         Fetch dynamic values from the form and populate the POST data.
 
         Args:
-            soup (BeautifulSoup): The BeautifulSoup object containing the form.
+            tree (html.HtmlElement): The parsed document containing the form.
 
         Returns:
             Dict[str, Any]: The populated POST data.
@@ -100,81 +244,48 @@ class FormHandler:
         fr_data = {}
 
         try:
-            for key, param in DATA_PARAMS.items():
-                attrs = self.get_attrs(key)
-                tag = soup.find(attrs=attrs)
+            tags, textareas = self._collect_tags(tree)
+
+            for key in DATA_PARAMS:
+                if key == "upTextareaControl":
+                    if not textareas:
+                        logger.warning(
+                            f"No matching element found for key: {key}, attributes: {self.get_attrs(key)}"
+                        )
+                        continue
+                    for i, textarea in enumerate(textareas):
+                        value = BASE_RESPONSE[key][i]
+                        name = _intern_name(textarea)
+                        data[name] = [value]
+                        fr_data[name] = value
+                    logger.opt(lazy=True).debug(
+                        "Extracted data for key '{}': {}", lambda: key, lambda: value
+                    )
+                    continue
 
-                if not tag:
+                tag = tags.get(key)
+                if tag is None:
                     logger.warning(
-                        f"No matching element found for key: {key}, attributes: {attrs}"
+                        f"No matching element found for key: {key}, attributes: {self.get_attrs(key)}"
                     )
                     continue
 
-                if key in [
-                    "Project",
-                    "Location",
-                    "Good Save Type",
-                    "Good Save Category",
-                    "Good Save Classification",
-                    "Risk Category",
-                    "jquery",
-                ]:
-                    if key == "Project" and tag.has_attr("name"):
-                        value = tag.contents[1].get("value", "")
-                    elif key == "jquery":
-                        value = tag.next_sibling.get("value", "")
-                    else:
-                        value = BASE_RESPONSE.get(key, "")
-
-                    data[tag["name"]] = [value]
-                    fr_data[tag["name"]] = value
-
-                    sibling = tag.parent.next_sibling
-                    if sibling and sibling.has_attr("name"):
-                        data[sibling["name"]] = [sibling.get("value", "")]
-                        fr_data[sibling["name"]] = sibling.get("value", "")
-
-                elif key == "upTextareaControl":
-                    textareas = soup.find_all(attrs=attrs)
-                    for i, textarea in enumerate(textareas):
-                        value = BASE_RESPONSE[key][i]
-                        data[textarea["name"]] = [value]
-                        fr_data[textarea["name"]] = value
-
-                elif key == "fr_ActionId":
-                    self.append_url_query(tag)
-                    value = tag.get("value", "")
-                    data[tag["name"]] = [value]
-                    fr_data[tag["name"]] = value
-
-                elif key == "fr_formState":
-                    value = tag.get("value")
-                    data[tag["name"]] = [value]
-                    fr_data[tag["name"]] = json.loads(value)
-
-                elif key == "Submitted By":
-                    value = BASE_RESPONSE.get(key, "Default User")
-                    data[tag["name"]] = [value]
-                    fr_data[tag["name"]] = value
-
-                elif key == "Header_Container_AppMain":
-                    fr_data["fr_formGuid"] = tag.get("class", "")[0][5:]
-                    fr_data["fr_formName"] = tag.get("name", "")
-                    fr_data["fr_uniqueId"] = tag.get("id", "")
-                    self.set_new_url(tag)
-
-                else:
-                    value = tag.get("value", "")
-                    data[tag["name"]] = [value]
-                    if key not in ["CSRFToken", "fr_fupUniqueId"]:
-                        fr_data[tag["name"]] = value
-
-                logger.debug(f"Extracted data for key '{key}': {value}")
-
-            data["fr_formData"] = [json.dumps([fr_data], separators=(",", ":"))]
-
-            with open("config/postdata.json", "w", encoding="utf-8") as file:
-                json.dump(data, file, ensure_ascii=False, indent=4)
+                handler = self._HANDLERS.get(key, FormHandler._handle_value)
+                value = handler(self, key, tag, data, fr_data)
+                if value is not None:
+                    logger.opt(lazy=True).debug(
+                        "Extracted data for key '{}': {}", lambda: key, lambda: value
+                    )
+
+            # orjson is compact by default, matching the old separators=(",", ":").
+            data["fr_formData"] = [orjson.dumps([fr_data]).decode()]
+
+            # The dump is a debugging aid; skip the disk write on production
+            # runs, and serialize in memory first so it lands in one write.
+            if TEST_MODE:
+                Path("config/postdata.json").write_bytes(
+                    orjson.dumps(data, option=orjson.OPT_INDENT_2)
+                )
                 logger.info("Dynamic form data saved to postdata.json.")
 
         except Exception as e:
@@ -183,16 +294,16 @@ class FormHandler:
 
         return data
 
-    def parse_cookie(self, soup: BeautifulSoup) -> None:
+    def parse_cookie(self, text: str | bytes) -> None:
         """
         Extract and set cookies from JavaScript in the response.
 
         Args:
-            soup (BeautifulSoup): The BeautifulSoup object containing the script tag.
+            text (str | bytes): The raw response body containing the script.
         """
-        self.cookie_handler.parse_and_set_cookies(soup)
+        self.cookie_handler.parse_and_set_cookies_from_js(text)
 
-    def submit_form(self) -> Optional[httpx.Response]:
+    async def submit_form(self) -> Optional[httpx.Response]:
         """
         Submit the form with the updated POST data.
 
@@ -200,14 +311,16 @@ class FormHandler:
             Optional[httpx.Response]: The response from the form submission, if any.
         """
         try:
-            response = self.client.get(self.path, params=self.query_params)
+            response = await self.client.get(self.path, params=self.query_params)
             logger.info("GET request completed successfully.")
-            soup = BeautifulSoup(response.text, "lxml")
-            self.parse_cookie(soup)
-            updated_post_data = self.fetch_dynamic_values(soup)
+            # Feed the raw bytes straight to lxml and the cookie scanner so
+            # the body is never decoded to str on this path.
+            tree = html.fromstring(response.content, parser=_HTML_PARSER)
+            self.parse_cookie(response.content)
+            updated_post_data = self.fetch_dynamic_values(tree)
 
             if not TEST_MODE:
-                response = self.client.post(
+                response = await self.client.post(
                     self.path, data=updated_post_data, params=self.query_params
                 )
                 logger.info("Form submission successful.")
@@ -1,19 +1,49 @@
-import json
+import asyncio
+import atexit
+import os
 import random
+import time
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from collections import deque
+from functools import lru_cache
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
+import aiohttp
 import httpx
+import orjson
 from loguru import logger
 
+_RECENT_HEADERS_FILE = Path("recent_headers.json")
+_COOKIES_FILE = Path("logs/cookies.json")
+# Created once at import so the save path never stats the directory again.
+_COOKIES_FILE.parent.mkdir(parents=True, exist_ok=True)
+
+
+def _header_key(headers: Dict[str, str]) -> bytes:
+    """Canonical serialized form of a headers dict, usable as a set member."""
+    return orjson.dumps(headers, option=orjson.OPT_SORT_KEYS)
+
+
+@lru_cache(maxsize=None)
+def _load_recent_headers() -> List[Dict[str, str]]:
+    """Load the most recent headers from disk, once per process."""
+    if _RECENT_HEADERS_FILE.exists():
+        headers = orjson.loads(_RECENT_HEADERS_FILE.read_bytes())
+        logger.debug("Recent headers loaded from file.")
+        return headers
+    logger.warning("No file with recent headers found.")
+    return []
+
 
 class IHTTPClient(ABC):
     @abstractmethod
-    def get(self, path: str, params: Optional[dict] = None) -> httpx.Response:
+    async def get(self, path: str, params: Optional[dict] = None) -> httpx.Response:
         pass
 
     @abstractmethod
-    def post(
+    async def post(
         self, path: str, data: dict, params: Optional[dict] = None
     ) -> httpx.Response:
         pass
@@ -25,61 +55,85 @@ class SessionManager:
     def __init__(self, base_url: str, timeout: httpx.Timeout):
         self.base_url = base_url
         self.timeout = timeout
-        self.session: Optional[httpx.Client] = None
+        self.session: Optional[httpx.AsyncClient] = None
 
-    def __enter__(self) -> "SessionManager":
-        self.session = httpx.Client(
-            base_url=self.base_url, follow_redirects=True, timeout=self.timeout
+    async def __aenter__(self) -> "SessionManager":
+        # HTTP/2 multiplexes the GET/POST pair over one TLS connection, and
+        # the keep-alive pool spares reconnects on repeated submissions.
+        self.session = httpx.AsyncClient(
+            base_url=self.base_url,
+            follow_redirects=True,
+            timeout=self.timeout,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=100,
+                max_connections=1000,
+                keepalive_expiry=75,
+            ),
         )
         logger.info("HTTP session started.")
         return self
 
-    def __exit__(self, exc_type, exc_value, traceback):
+    async def __aexit__(self, exc_type, exc_value, traceback):
         if self.session:
-            self.session.close()
+            await self.session.aclose()
             logger.info("HTTP session closed.")
 
 
 class HeaderManager:
     """Handles loading, saving, and selecting headers."""
 
-    def __init__(self, headers_list: List[Dict[str, str]]):
+    def __init__(
+        self, headers_list: List[Dict[str, str]], persist_recent_headers: bool = True
+    ):
         self.headers_list = headers_list
-        self.recent_headers = self.get_recent_headers()
+        self.persist_recent_headers = persist_recent_headers
+        # maxlen=3 keeps only the latest three headers, dropping the oldest
+        # automatically on appendleft.
+        self.recent_headers = deque(self.get_recent_headers(), maxlen=3)
+        self._recent_keys = {_header_key(h) for h in self.recent_headers}
+        self._dirty = False
         self.random_headers = self.get_random_headers()
+        if self.persist_recent_headers:
+            atexit.register(self._flush)
 
     def get_recent_headers(self) -> List[Dict[str, str]]:
-        """Load the most recent headers from a file."""
-        if Path("recent_headers.json").exists():
-            with open("recent_headers.json", "r", encoding="utf-8") as f:
-                headers = json.load(f)
-                logger.debug("Recent headers loaded from file.")
-                return headers
-        logger.warning("No file with recent headers found.")
-        return []
+        """Return the most recent headers, loaded from file once per process."""
+        if not self.persist_recent_headers:
+            return []
+        return list(_load_recent_headers())
 
     def save_recent_headers(self, headers: Dict[str, str]):
         """Save the current headers to the recent headers list."""
-        self.recent_headers.insert(0, headers)
-        self.recent_headers = self.recent_headers[
-            :3
-        ]  # Keep only the latest three headers
-        logger.debug(f"Updated recent headers: {self.recent_headers}")
+        self.recent_headers.appendleft(headers)
+        self._recent_keys = {_header_key(h) for h in self.recent_headers}
+        self._dirty = True
 
     def get_random_headers(self) -> Dict[str, str]:
         """Select random headers from the available list."""
-        candidate = None
-        while not candidate or candidate in self.recent_headers:
-            candidate = random.choice(self.headers_list)
+        # One filtered pass and a single draw; the old rejection loop could
+        # spin forever when headers_list is no bigger than the recency window.
+        eligible = [
+            h for h in self.headers_list if _header_key(h) not in self._recent_keys
+        ]
+        candidate = random.choice(eligible or self.headers_list)
         self.save_recent_headers(candidate)
-        logger.debug(f"Selected headers: {candidate}")
+        logger.opt(lazy=True).debug("Selected headers: {}", lambda: candidate)
         return candidate
 
     def save_headers_to_file(self):
-        """Save recent headers to a file."""
-        with open("recent_headers.json", "w", encoding="utf-8") as f:
-            json.dump(self.recent_headers, f)
-            logger.debug("Recent headers saved to file.")
+        """Mark recent headers for flushing; the write happens at shutdown."""
+        self._dirty = True
+
+    def _flush(self):
+        """Write recent headers to disk atomically if they changed."""
+        if not self.persist_recent_headers or not self._dirty:
+            return
+        tmp_file = _RECENT_HEADERS_FILE.with_suffix(".json.tmp")
+        tmp_file.write_bytes(orjson.dumps(list(self.recent_headers)))
+        os.replace(tmp_file, _RECENT_HEADERS_FILE)
+        self._dirty = False
+        logger.debug("Recent headers saved to file.")
 
 
 class HTTPClient(IHTTPClient):
@@ -90,6 +144,7 @@ class HTTPClient(IHTTPClient):
         base_url: str,
         headers_list: List[Dict[str, str]],
         timeout: httpx.Timeout = httpx.Timeout(30.0, connect=15.0, read=60.0),
+        persist_recent_headers: bool = True,
     ):
         self.base_url = base_url
         self.headers_list = headers_list
@@ -97,26 +152,84 @@ class HTTPClient(IHTTPClient):
         self.session_manager = SessionManager(
             base_url=self.base_url, timeout=self.timeout
         )
-        self.header_manager = HeaderManager(headers_list=self.headers_list)
+        self.header_manager = HeaderManager(
+            headers_list=self.headers_list,
+            persist_recent_headers=persist_recent_headers,
+        )
         logger.info(f"HTTPClient initialized with base_url: {self.base_url}")
 
-    def __enter__(self) -> "HTTPClient":
-        self.session_manager.__enter__()
+    async def __aenter__(self) -> "HTTPClient":
+        await self.session_manager.__aenter__()
         self.session = self.session_manager.session
         self.session.headers.update(self.header_manager.random_headers)
+        self._load_cookies()
         return self
 
-    def __exit__(self, exc_type, exc_value, traceback):
-        self.session_manager.__exit__(exc_type, exc_value, traceback)
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.session_manager.session is not None:
+            self._save_cookies()
+        await self.session_manager.__aexit__(exc_type, exc_value, traceback)
         self.header_manager.save_headers_to_file()
 
-    def get(self, path: str, params: Optional[dict] = None) -> httpx.Response:
+    def _load_cookies(self):
+        """Restore cookies from a previous run, skipping expired entries."""
+        if not _COOKIES_FILE.exists():
+            return
+        now = time.time()
+        restored = 0
+        for cookie in orjson.loads(_COOKIES_FILE.read_bytes()):
+            if cookie.get("expires") is not None and cookie["expires"] <= now:
+                continue
+            self.session.cookies.set(
+                cookie["name"],
+                cookie["value"],
+                domain=cookie.get("domain", ""),
+                path=cookie.get("path", "/"),
+            )
+            restored += 1
+        if restored:
+            logger.info(f"Restored {restored} cookies from the previous session.")
+
+    def _save_cookies(self):
+        """Persist the session's cookies so the next run can resume them."""
+        cookies = [
+            {
+                "name": c.name,
+                "value": c.value,
+                "domain": c.domain,
+                "path": c.path,
+                "expires": c.expires,
+            }
+            for c in self.session.cookies.jar
+        ]
+        _COOKIES_FILE.write_bytes(orjson.dumps(cookies))
+        logger.debug(f"Saved {len(cookies)} cookies to {_COOKIES_FILE}.")
+
+    async def start(self) -> "HTTPClient":
+        """Open the underlying session if it is not open yet."""
+        if self.session_manager.session is None:
+            await self.__aenter__()
+        return self
+
+    async def close(self) -> None:
+        """Close the underlying session."""
+        await self.__aexit__(None, None, None)
+
+    def new_cookie(self, cookie: Tuple[str, str], domain: str, path: str = "/"):
+        """Set a cookie on the session's cookie jar."""
+        name, value = cookie
+        self.session.cookies.set(name, value, domain=domain, path=path)
+
+    async def get(self, path: str, params: Optional[dict] = None) -> httpx.Response:
         """Send a GET request to the specified path."""
         try:
             logger.info(f"Sending GET request to {path} with params {params}")
-            response = self.session.get(path, params=params)
-            logger.debug(
-                f"GET response: {response.status_code}, content preview: {response.text[:100]}..."
+            response = await self.session.get(path, params=params)
+            # Lazy so the body is not decoded and sliced when DEBUG is off.
+            logger.opt(lazy=True).debug(
+                "GET response: {}, content preview: {}...",
+                lambda: response.status_code,
+                lambda: response.text[:100],
             )
             response.raise_for_status()
             return response
@@ -127,7 +240,7 @@ class HTTPClient(IHTTPClient):
             logger.error(f"Request error during GET request: {e}")
             raise
 
-    def post(
+    async def post(
         self, path: str, data: dict, params: Optional[dict] = None
     ) -> httpx.Response:
         """Send a POST request to the specified path."""
@@ -135,9 +248,11 @@ class HTTPClient(IHTTPClient):
             logger.info(
                 f"Sending POST request to {path} with data {data} and params {params}"
             )
-            response = self.session.post(path, data=data, params=params)
-            logger.debug(
-                f"POST response: {response.status_code}, content preview: {response.text[:100]}..."
+            response = await self.session.post(path, data=data, params=params)
+            logger.opt(lazy=True).debug(
+                "POST response: {}, content preview: {}...",
+                lambda: response.status_code,
+                lambda: response.text[:100],
             )
             response.raise_for_status()
             return response
@@ -147,3 +262,156 @@ class HTTPClient(IHTTPClient):
         except httpx.RequestError as e:
             logger.error(f"Request error during POST request: {e}")
             raise
+
+
+class AiohttpResponse:
+    """Minimal response wrapper matching the httpx attributes we consume."""
+
+    def __init__(
+        self,
+        status_code: int,
+        content: bytes,
+        encoding: str,
+        headers: Any,
+        cookies: Any,
+    ):
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.headers = headers
+        self.cookies = cookies
+        self._text: Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """Decoded body, computed lazily since the hot path reads bytes."""
+        if self._text is None:
+            self._text = self.content.decode(self.encoding, errors="replace")
+        return self._text
+
+
+class AiohttpHTTPClient(IHTTPClient):
+    """IHTTPClient backed by aiohttp, for lower tail latency under heavy concurrency."""
+
+    def __init__(
+        self,
+        base_url: str,
+        headers_list: List[Dict[str, str]],
+        timeout: aiohttp.ClientTimeout = aiohttp.ClientTimeout(
+            total=60.0, connect=15.0
+        ),
+        persist_recent_headers: bool = True,
+    ):
+        self.base_url = base_url
+        self.headers_list = headers_list
+        self.timeout = timeout
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.header_manager = HeaderManager(
+            headers_list=self.headers_list,
+            persist_recent_headers=persist_recent_headers,
+        )
+        logger.info(f"AiohttpHTTPClient initialized with base_url: {self.base_url}")
+
+    async def __aenter__(self) -> "AiohttpHTTPClient":
+        self.session = aiohttp.ClientSession(
+            base_url=self.base_url,
+            connector=aiohttp.TCPConnector(
+                limit=1000, limit_per_host=64, keepalive_timeout=75
+            ),
+            headers=self.header_manager.random_headers,
+            timeout=self.timeout,
+        )
+        logger.info("HTTP session started.")
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if self.session:
+            await self.session.close()
+            logger.info("HTTP session closed.")
+        self.header_manager.save_headers_to_file()
+
+    def new_cookie(self, cookie: Tuple[str, str], domain: str, path: str = "/"):
+        """Set a cookie on the session's cookie jar."""
+        name, value = cookie
+        jar_cookie = SimpleCookie()
+        jar_cookie[name] = value
+        jar_cookie[name]["domain"] = domain
+        jar_cookie[name]["path"] = path
+        self.session.cookie_jar.update_cookies(jar_cookie)
+
+    async def get(self, path: str, params: Optional[dict] = None) -> AiohttpResponse:
+        """Send a GET request to the specified path."""
+        try:
+            logger.info(f"Sending GET request to {path} with params {params}")
+            async with self.session.get(path, params=params) as response:
+                content = await response.read()
+                logger.opt(lazy=True).debug(
+                    "GET response: {}, content preview: {}...",
+                    lambda: response.status,
+                    lambda: content[:100],
+                )
+                response.raise_for_status()
+                return AiohttpResponse(
+                    response.status,
+                    content,
+                    response.get_encoding(),
+                    response.headers,
+                    response.cookies,
+                )
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"HTTP error during GET request: {e.status}")
+            raise
+        except aiohttp.ClientError as e:
+            logger.error(f"Request error during GET request: {e}")
+            raise
+
+    async def post(
+        self, path: str, data: dict, params: Optional[dict] = None
+    ) -> AiohttpResponse:
+        """Send a POST request to the specified path."""
+        try:
+            logger.info(
+                f"Sending POST request to {path} with data {data} and params {params}"
+            )
+            async with self.session.post(path, data=data, params=params) as response:
+                content = await response.read()
+                logger.opt(lazy=True).debug(
+                    "POST response: {}, content preview: {}...",
+                    lambda: response.status,
+                    lambda: content[:100],
+                )
+                response.raise_for_status()
+                return AiohttpResponse(
+                    response.status,
+                    content,
+                    response.get_encoding(),
+                    response.headers,
+                    response.cookies,
+                )
+        except aiohttp.ClientResponseError as e:
+            logger.error(f"HTTP error during POST request: {e.status}")
+            raise
+        except aiohttp.ClientError as e:
+            logger.error(f"Request error during POST request: {e}")
+            raise
+
+
+# Process-wide client shared across form submissions so repeated flows reuse
+# the same connection pool instead of paying TCP+TLS setup per run.
+_CLIENT: Optional[HTTPClient] = None
+
+
+def _close_client_at_exit():
+    """Best-effort close of the shared client at interpreter shutdown."""
+    if _CLIENT is not None and _CLIENT.session_manager.session is not None:
+        asyncio.run(_CLIENT.close())
+
+
+async def get_client(base_url: str, headers_list: List[Dict[str, str]]) -> HTTPClient:
+    """Return the shared HTTPClient, creating and starting it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = HTTPClient(base_url=base_url, headers_list=headers_list)
+        await _CLIENT.start()
+        atexit.register(_close_client_at_exit)
+    return _CLIENT
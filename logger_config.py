@@ -1,20 +1,33 @@
+import os
+import sys
+
 from loguru import logger
 
+# Guards against sinks being re-added (and log lines duplicated) when
+# setup_logger is called from more than one importing module.
+_INITIALIZED = False
+
 
 def setup_logger():
     """Setup and configure loguru logger."""
+    global _INITIALIZED
+    if _INITIALIZED:
+        return logger
     logger.remove()
 
     log_format = "{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}"
     log_rotation = "10 MB"
     log_retention = "10 days"
 
+    # enqueue=True hands records to a writer thread, so logging on the
+    # request path costs a queue put instead of a synchronous file write.
     logger.add(
         "logs/debug.log",
         format=log_format,
         level="DEBUG",
         rotation=log_rotation,
         retention=log_retention,
+        enqueue=True,
     )
     logger.add(
         "logs/error.log",
@@ -22,6 +35,13 @@ def setup_logger():
         level="ERROR",
         rotation=log_rotation,
         retention=log_retention,
+        enqueue=True,
     )
+
+    # Mirror to stderr only when explicitly debugging an interactive run.
+    if os.environ.get("DEBUG") and sys.stderr.isatty():
+        logger.add(sys.stderr, format=log_format, level="DEBUG", colorize=True)
+
+    _INITIALIZED = True
     logger.info("Logger initialized.")
     return logger
@@ -1,15 +1,13 @@
-import json
-import random
-from functools import lru_cache
+import asyncio
+from dataclasses import dataclass
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
-from urllib.parse import parse_qs, urlparse
+from typing import Any, Dict, List, Optional
 
-from bs4 import BeautifulSoup
+from config import BASE_URL, HEADERS_LIST, PATH, QUERY_PARAMS
 from form_handler import FormHandler
 from http_client import HTTPClient
-from loguru import logger
-from pydantic import BaseModel
+from logger_config import setup_logger
 
 # Setup logging
 logger = setup_logger()
@@ -18,88 +16,61 @@ logger = setup_logger()
 LOGS_DIR = Path("logs")
 
 # File paths
-CONFIG_FILE = Path("config/config.json")
 RECENT_HEADERS_FILE = Path("recent_headers.json")
 RESPONSE_HTML_FILE = LOGS_DIR / "response_html.html"
 POST_RESPONSE_HTML_FILE = LOGS_DIR / "post_response_xnl.xml"
 
-
-@lru_cache(maxsize=None)
-def load_config() -> (
-    Tuple[
-        str,
-        str,
-        str,
-        Dict[str, List[str]],
-        List[Dict[str, str]],
-        Dict[str, Dict[str, Any]],
-        Dict[str, Any],
-    ]
-):
-    """Load configuration from config.json and parse URL."""
-    with open(CONFIG_FILE, "r") as config_file:
-        config = json.load(config_file)
-
-    parsed_url = urlparse(config["url"])
-    base_url = f"{parsed_url.scheme}://{parsed_url.netloc}"
-    path = parsed_url.path
-    host = parsed_url.netloc
-    query_params = parse_qs(parsed_url.query)
-
-    # Dynamiskt val av ett `base_response`
-    if "base_responses" in config and config["base_responses"]:
-        base_response = random.choice(config["base_responses"])
-        logger.debug(f"Selected dynamic base_response: {base_response}")
-    else:
-        base_response = {}
-        logger.warning("No base_responses found in config.json, using empty response.")
-
-    test_mode = config.get("test_mode", False)
-    logger.debug("Loaded configuration successfully.")
-    return (
-        base_url,
-        path,
-        host,
-        query_params,
-        config["headers_list"],
-        config["data_params"],
-        base_response,
-        config["form_post_url"],
-        test_mode,
-    )
-
-
-(
-    BASE_URL,
-    PATH,
-    HOST,
-    QUERY_PARAMS,
-    HEADERS_LIST,
-    DATA_PARAMS,
-    BASE_RESPONSE,
-    FORM_POST_URL,
-    TEST_MODE,
-) = load_config()
 POST_URL = None
 
+# Concurrency caps for batched runs: flows are gathered in batches of
+# BATCH_SIZE, with at most CONCURRENCY requests in flight at once.
+BATCH_SIZE = 16
+CONCURRENCY = 64
+
 
-class FormData(BaseModel):
-    """Model to represent and validate form data."""
+@dataclass(slots=True)
+class FormData:
+    """Model to represent form data."""
 
     data: Dict[str, Any]
 
 
-if __name__ == "__main__":
+async def run_one(client: HTTPClient, semaphore: asyncio.Semaphore) -> Optional[Any]:
+    """Run a single GET -> parse -> POST form flow."""
+    async with semaphore:
+        response = await client.get(PATH, params=QUERY_PARAMS)
+        form_handler = FormHandler(
+            client=client,
+            form_data=FormData(data={}),
+            path=PATH,
+            # Each flow gets its own copy; the handler mutates it in place.
+            query_params=dict(QUERY_PARAMS),
+        )
+        form_handler.parse_cookie(response.content)
+        return await form_handler.submit_form()
+
+
+async def run_batch(count: int) -> List[Any]:
+    """Run `count` form flows concurrently, in bounded batches."""
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    results: List[Any] = []
+    async with HTTPClient(base_url=BASE_URL, headers_list=HEADERS_LIST) as client:
+        flows = (run_one(client, semaphore) for _ in range(count))
+        while batch := list(islice(flows, BATCH_SIZE)):
+            results.extend(await asyncio.gather(*batch))
+    return results
+
+
+async def main() -> None:
     logger.info("Starting application.")
 
     try:
-        with HTTPClient(base_url=BASE_URL, headers_list=HEADERS_LIST) as client:
+        async with HTTPClient(base_url=BASE_URL, headers_list=HEADERS_LIST) as client:
             logger.info("HTTPClient initialized successfully.")
 
-            response = client.get(PATH, params=QUERY_PARAMS)
+            response = await client.get(PATH, params=QUERY_PARAMS)
             logger.info("Initial GET request successful.")
 
-            soup = BeautifulSoup(response.text, "html.parser")
             form_handler = FormHandler(
                 client=client,
                 form_data=FormData(data={}),
@@ -107,10 +78,10 @@ if __name__ == "__main__":
                 query_params=QUERY_PARAMS,
             )
 
-            form_handler.parse_cookie(soup)
+            form_handler.parse_cookie(response.content)
             logger.info("Cookies parsed and set.")
 
-            post_response = form_handler.submit_form()
+            post_response = await form_handler.submit_form()
             if post_response:
                 logger.info(
                     f"Form submitted successfully. Response: {post_response.text[:100]}..."
@@ -120,3 +91,7 @@ if __name__ == "__main__":
 
     except Exception as e:
         logger.critical(f"Application terminated due to an error: {e}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())